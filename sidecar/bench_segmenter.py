@@ -0,0 +1,110 @@
+import argparse
+import time
+import unicodedata
+
+from vi_segmenter import segment_vietnamese
+
+# Compares the rule-based Vietnamese segmenter against underthesea.sent_tokenize:
+# import cost, throughput and sentence-boundary agreement on a sample corpus.
+# The import cost is what the rule segmenter mainly saves; per-call throughput is close.
+# Usage: python bench_segmenter.py [--corpus file.txt] [--repeat 50]
+
+SAMPLE_CORPUS = """
+Hà Nội là thủ đô của nước Cộng hòa Xã hội Chủ nghĩa Việt Nam. Thành phố nằm bên bờ sông Hồng. Dân số khoảng 8,4 triệu người vào năm 2023.
+
+TP. Hồ Chí Minh là trung tâm kinh tế lớn nhất cả nước! Mỗi năm thành phố đóng góp khoảng 22% GDP. Bạn đã từng đến đó chưa?
+
+PGS.TS. Nguyễn Văn A. cho biết kết quả nghiên cứu sẽ được công bố vào ngày 15/8. Theo ông, đây là bước tiến quan trọng. ThS. Trần Thị B. đồng tình với nhận định này.
+
+Giá vàng hôm nay tăng lên 1.250.000 đồng mỗi chỉ. Nhiều người dân xếp hàng từ sáng sớm để mua. Tuy nhiên, các chuyên gia khuyến cáo nên thận trọng.
+
+"Chúng tôi sẽ cố gắng hết sức," anh Minh nói. "Đội bóng đã chuẩn bị rất kỹ." Trận đấu bắt đầu lúc 19:30 tối nay.
+
+Công ty cần tuyển kỹ sư, lập trình viên, nhân viên kinh doanh, v.v. Ứng viên vui lòng gửi hồ sơ trước ngày 30/9. Mọi thắc mắc xin liên hệ số điện thoại trong thông báo.
+
+Trời bắt đầu mưa... nhưng chúng tôi vẫn tiếp tục hành trình. Đến chiều, mây tan dần. Cả đoàn dừng chân bên một quán nước ven đường.
+
+Dr. Smith đến Việt Nam năm 1995. Ông đã làm việc tại Q. 1 trong nhiều năm. Hiện nay ông sống ở Đà Nẵng cùng gia đình.
+
+Vì sao lá cây có màu xanh? Đó là nhờ chất diệp lục. Chất này giúp cây hấp thụ ánh sáng mặt trời để quang hợp.
+
+1. Chuẩn bị nguyên liệu. 2. Rửa sạch rau củ. 3. Nấu nước dùng trong khoảng 2 giờ. Món ăn sẽ ngon hơn nếu dùng nóng.
+"""
+
+
+def load_paragraphs(corpus_path):
+    if corpus_path:
+        with open(corpus_path, "r", encoding="utf-8-sig") as f:
+            raw = f.read()
+    else:
+        raw = SAMPLE_CORPUS
+    raw = unicodedata.normalize("NFC", raw)
+    paragraphs = [" ".join(p.split()) for p in raw.split("\n\n")]
+    return [p for p in paragraphs if p]
+
+
+def sentence_ends(text, sentences):
+    ends = set()
+    cursor = 0
+    for sentence in sentences:
+        sentence = sentence.strip()
+        pos = text.find(sentence, cursor)
+        if pos < 0:
+            continue
+        cursor = pos + len(sentence)
+        ends.add(cursor)
+    return ends
+
+
+def time_segmenter(fn, paragraphs, repeat):
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        for paragraph in paragraphs:
+            fn(paragraph)
+    return time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=str, required=False)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    paragraphs = load_paragraphs(args.corpus)
+    total_chars = sum(len(p) for p in paragraphs) * args.repeat
+
+    begin = time.perf_counter()
+    from underthesea import sent_tokenize
+
+    import_seconds = time.perf_counter() - begin
+
+    rule_seconds = time_segmenter(lambda p: segment_vietnamese(p, max_words=10**9), paragraphs, args.repeat)
+    ref_seconds = time_segmenter(sent_tokenize, paragraphs, args.repeat)
+
+    matched = predicted = expected = exact = reference_total = 0
+    for paragraph in paragraphs:
+        reference = [s.strip() for s in sent_tokenize(paragraph) if s.strip()]
+        rule = [paragraph[start:end] for start, end in segment_vietnamese(paragraph, max_words=10**9)]
+        ref_ends = sentence_ends(paragraph, reference)
+        rule_ends = sentence_ends(paragraph, rule)
+        matched += len(ref_ends & rule_ends)
+        predicted += len(rule_ends)
+        expected += len(ref_ends)
+        exact += len(set(reference) & set(rule))
+        reference_total += len(reference)
+
+    precision = matched / predicted if predicted else 0.0
+    recall = matched / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    print(f"Paragraphs: {len(paragraphs)} x {args.repeat} ({total_chars} chars)")
+    print(f"underthesea import: {import_seconds * 1000:.1f} ms")
+    print(f"underthesea:        {ref_seconds * 1000:.1f} ms ({total_chars / ref_seconds / 1e6:.2f} MB/s)")
+    print(f"rule segmenter:     {rule_seconds * 1000:.1f} ms ({total_chars / rule_seconds / 1e6:.2f} MB/s)")
+    print(f"speed-up:           {ref_seconds / rule_seconds:.1f}x")
+    print(f"boundary precision/recall/F1: {precision:.3f} / {recall:.3f} / {f1:.3f}")
+    print(f"exact sentence agreement:     {exact}/{reference_total} ({exact / max(reference_total, 1):.1%})")
+
+
+if __name__ == "__main__":
+    main()
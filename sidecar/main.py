@@ -6,6 +6,12 @@ import inspect
 import warnings
 import unicodedata
 import shutil
+import threading
+import gc
+import struct
+import functools
+from multiprocessing import resource_tracker, shared_memory
+from contextlib import contextmanager
 
 # Suppress typeguard instrumentation warnings
 warnings.filterwarnings("ignore", message="instrumentor did not find the target function")
@@ -106,9 +112,10 @@ from chatterbox.mtl_tts import ChatterboxMultilingualTTS
 from faster_whisper import WhisperModel
 from vieneu import Vieneu
 import torch
-import torchaudio
 
 import time
+import numpy as np
+import soundfile as sf
 from pydub import AudioSegment
 import re
 
@@ -117,10 +124,15 @@ try:
 except Exception:
     TTSnorm = None
 
+from vi_segmenter import segment_vietnamese, split_vietnamese_sentences
+
+# underthesea is slow to import; it is loaded on first use by load_sent_tokenize().
+_sent_tokenize = None
+
 try:
-    from underthesea import sent_tokenize
+    import psutil
 except Exception:
-    sent_tokenize = None
+    psutil = None
 
 def get_base_path():
     if getattr(sys, 'frozen', False):
@@ -454,22 +466,38 @@ def calculate_keep_len(text: str, lang: str) -> int:
     return -1
 
 
-def split_tts_sentences(text: str, lang: str):
+SENTENCE_SEGMENTERS = ("underthesea", "rule")
+
+
+def load_sent_tokenize():
+    global _sent_tokenize
+    if _sent_tokenize is None:
+        try:
+            from underthesea import sent_tokenize
+        except Exception:
+            sent_tokenize = False
+        _sent_tokenize = sent_tokenize
+    return _sent_tokenize or None
+
+
+def split_tts_sentences(text: str, lang: str, segmenter: str | None = None):
     if lang in ["ja", "zh-cn"]:
         chunks = [s.strip() for s in text.split("\u3002") if s.strip()]
         return chunks if chunks else [text]
 
-    if lang == "vi" and sent_tokenize is not None:
-        try:
-            chunks = [s.strip() for s in sent_tokenize(text) if s.strip()]
-            chunks = _split_long_vi_chunks(chunks)
-            return chunks if chunks else [text]
-        except Exception:
-            pass
+    if lang == "vi":
+        sent_tokenize = load_sent_tokenize() if segmenter != "rule" else None
+        if sent_tokenize is not None:
+            try:
+                chunks = [s.strip() for s in sent_tokenize(text) if s.strip()]
+                chunks = _split_long_vi_chunks(chunks)
+                return chunks if chunks else [text]
+            except Exception:
+                pass
+        chunks = split_vietnamese_sentences(text)
+        return chunks if chunks else [text]
 
     chunks = [s.strip() for s in re.split(r"(?<=[.?!])\s+", text) if s.strip()]
-    if lang == "vi":
-        chunks = _split_long_vi_chunks(chunks)
     return chunks if chunks else [text]
 
 
@@ -510,12 +538,11 @@ def normalize_chatterbox_language(language: str) -> str:
     return lang
 
 
-def infer_chatterbox_to_file(
+def generate_chatterbox_wav(
     chatterbox_model,
     text: str,
     language: str,
     speaker_wav: str,
-    output_file: str,
     temperature: float,
     top_p: float = 1.0,
     repetition_penalty: float = 2.0,
@@ -524,7 +551,7 @@ def infer_chatterbox_to_file(
     supported = set(ChatterboxMultilingualTTS.get_supported_languages().keys())
     if lang not in supported:
         lang = "en"
-    wav = chatterbox_model.generate(
+    return chatterbox_model.generate(
         text=text,
         language_id=lang,
         audio_prompt_path=speaker_wav,
@@ -532,24 +559,757 @@ def infer_chatterbox_to_file(
         top_p=max(0.1, min(float(top_p), 1.0)),
         repetition_penalty=max(1.0, min(float(repetition_penalty), 4.0)),
     )
-    torchaudio.save(output_file, wav, chatterbox_model.sr)
 
 
-def infer_vieneu_to_file(
-    vieneu_model,
-    text: str,
-    speaker_wav: str,
-    speaker_text: str,
-    output_file: str,
-    temperature: float,
-):
-    audio = vieneu_model.infer(
+def generate_vieneu_audio(vieneu_model, text: str, speaker_wav: str, speaker_text: str, temperature: float):
+    return vieneu_model.infer(
         text=text,
         ref_audio=speaker_wav,
         ref_text=speaker_text,
         temperature=max(0.1, min(float(temperature), 1.5)),
     )
-    vieneu_model.save(audio, output_file)
+
+
+def audio_to_mono_numpy(audio) -> np.ndarray:
+    if isinstance(audio, torch.Tensor):
+        audio = audio.detach().cpu().numpy()
+    return np.asarray(audio, dtype=np.float32).reshape(-1)
+
+
+def vieneu_sample_rate(vieneu_model) -> int:
+    # VieNeu-TTS decodes with NeuCodec at 24 kHz.
+    return int(getattr(vieneu_model, "sample_rate", 24000))
+
+
+MAX_PARAGRAPH_CHARS = 16 * 1024
+
+
+def iter_text_file_paragraphs(path: str, max_chars: int = MAX_PARAGRAPH_CHARS):
+    # Every non-empty line is a paragraph, yielded as (index, offset, paragraph) with the
+    # character offset into the file text as the UI reads it: newline="" keeps "\r\n" and a
+    # leading BOM is counted. Reads are capped at max_chars, so a file without line breaks
+    # is cut at the last whitespace and memory stays flat; the pieces of a cut line keep
+    # its paragraph index.
+    carry = ""
+    consumed = 0
+    index = 0
+    with open(path, "r", encoding="utf-8", errors="replace", newline="", buffering=1 << 16) as f:
+        while True:
+            piece = f.readline(max_chars - len(carry))
+            line_start = consumed - len(carry)
+            consumed += len(piece)
+            line = carry + piece
+            carry = ""
+            if not line:
+                break
+            line_ended = line.endswith(("\n", "\r"))
+            if not line_ended and len(line) >= max_chars:
+                cut = max(line.rfind(" "), line.rfind("\t"))
+                if cut > 0:
+                    line, carry = line[:cut], line[cut + 1:]
+            lead = len(line) - len(line.lstrip("\ufeff").lstrip())
+            paragraph = line[lead:].rstrip()
+            if paragraph:
+                yield index, line_start + lead, paragraph
+            if line_ended:
+                index += 1
+
+
+def iter_text_paragraphs(text: str):
+    for index, match in enumerate(re.finditer(r"[^\r\n]+", text)):
+        line = match.group()
+        lead = len(line) - len(line.lstrip("\ufeff").lstrip())
+        paragraph = line[lead:].rstrip()
+        if paragraph:
+            yield index, match.start() + lead, paragraph
+
+
+def iter_tts_chunks(paragraphs, lang: str, segmenter: str | None = None):
+    # Yields (paragraph_index, chunk, start, end). With the rule segmenter the raw paragraph
+    # is segmented before normalization, so start/end point at the chunk in the original
+    # text; other segmenters work on normalized text and report the paragraph's extent.
+    for index, offset, paragraph in paragraphs:
+        if lang == "vi" and segmenter == "rule":
+            for start, end in segment_vietnamese(paragraph):
+                chunk = normalize_vietnamese_text(paragraph[start:end]).strip()
+                if not chunk:
+                    continue
+                # Normalization spells out numbers and units ("1.250.000", "22%"), so the
+                # word limit is re-applied to the text the model actually receives.
+                for piece in _split_long_vi_chunks([chunk]):
+                    yield index, piece, offset + start, offset + end
+            continue
+        paragraph_end = offset + len(paragraph)
+        if lang == "vi":
+            paragraph = normalize_vietnamese_text(paragraph)
+        for chunk in split_tts_sentences(paragraph, lang, segmenter):
+            if chunk.strip():
+                yield index, chunk, offset, paragraph_end
+
+
+AUDIO_TRANSPORTS = ("file", "shm")
+
+
+class SharedAudioRing:
+    # Named shared-memory ring buffer for mono PCM16 audio.
+    # Layout: a 64-byte header followed by `capacity` data bytes.
+    #   offset 0:  magic, capacity, sample_rate, generation, write_pos, seq, owner_pid   (writer-owned)
+    #   offset 48: read_pos                                                               (reader-owned)
+    # write_pos/read_pos count every byte ever written/consumed. The writer header is a
+    # seqlock: generation is odd while it is being updated, so readers read generation,
+    # the fields, then generation again, and retry if the two differ or are odd.
+    # Backpressure: when the ring is full the writer waits up to reader_timeout seconds
+    # for read_pos to advance. If the reader is still behind, the oldest unread audio is
+    # overwritten and reported as AUDIO_OVERRUN|<name>|<bytes>; waiting resumes once the
+    # reader moves again. Readers that fall behind detect it as write_pos - read_pos > capacity.
+    # Each published slice is contiguous and announced on stdout as
+    # AUDIO_CHUNK|<name>|<buffer offset>|<nbytes>|<sample_rate>|<seq>.
+    HEADER = struct.Struct("<8sIIQQQQ")
+    READ_POS = struct.Struct("<Q")
+    READ_POS_OFFSET = 48
+    HEADER_SIZE = 64
+    MAGIC = b"VEPCM16\0"
+
+    def __init__(self, name=None, capacity_bytes=16 * 1024 * 1024, reader_timeout=2.0):
+        capacity_bytes -= capacity_bytes % 2
+        self.capacity = capacity_bytes
+        self.reader_timeout = reader_timeout
+        self.shm = self._create(name, self.HEADER_SIZE + capacity_bytes)
+        self.generation = 0
+        self.write_pos = 0
+        self.seq = 0
+        self.sample_rate = 0
+        self._stalled_at = None
+        self.READ_POS.pack_into(self.shm.buf, self.READ_POS_OFFSET, 0)
+        self._write_header()
+
+    @classmethod
+    def _create(cls, name, size):
+        try:
+            return shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not cls._reclaim_stale(name):
+                raise ValueError(f"Shared memory segment {name} is in use by another process.")
+            print(f"WARNING: replaced stale shared memory segment {name}.")
+            return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    @classmethod
+    def _reclaim_stale(cls, name):
+        # Removes a ring left behind by a daemon that died before unlinking it. Segments that
+        # are not ours, or whose owner is still running, are left alone.
+        if os.name == "nt":
+            # Windows frees a segment with its last handle, so an existing one is always live.
+            return False
+        existing = shared_memory.SharedMemory(name=name)
+        try:
+            stale = False
+            if existing.size >= cls.HEADER_SIZE:
+                fields = cls.HEADER.unpack_from(existing.buf, 0)
+                stale = fields[0] == cls.MAGIC and not _pid_alive(fields[6])
+        finally:
+            existing.close()
+        if stale:
+            existing.unlink()
+        else:
+            # Attaching registered the segment with the resource tracker, which would unlink
+            # it when this process exits.
+            resource_tracker.unregister(existing._name, "shared_memory")
+        return stale
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def read_pos(self):
+        return self.READ_POS.unpack_from(self.shm.buf, self.READ_POS_OFFSET)[0]
+
+    def _write_header(self):
+        self.generation += 1
+        struct.pack_into("<Q", self.shm.buf, 16, self.generation)
+        self.HEADER.pack_into(
+            self.shm.buf,
+            0,
+            self.MAGIC,
+            self.capacity,
+            self.sample_rate,
+            self.generation,
+            self.write_pos,
+            self.seq,
+            os.getpid(),
+        )
+        self.generation += 1
+        struct.pack_into("<Q", self.shm.buf, 16, self.generation)
+
+    def _free_bytes(self):
+        if self._stalled_at is not None:
+            if self.read_pos == self._stalled_at:
+                return self.capacity
+            self._stalled_at = None
+        deadline = time.monotonic() + self.reader_timeout
+        while True:
+            read_pos = self.read_pos
+            free = self.capacity - (self.write_pos - read_pos)
+            if free > 0:
+                return free
+            if time.monotonic() >= deadline:
+                self._stalled_at = read_pos
+                return self.capacity
+            time.sleep(0.005)
+
+    def write(self, audio: np.ndarray, sample_rate: int):
+        self.sample_rate = int(sample_rate)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype("<i2")
+        data = memoryview(pcm).cast("B")
+        cursor = 0
+        while cursor < len(data):
+            free = self._free_bytes()
+            ring_offset = self.write_pos % self.capacity
+            nbytes = min(len(data) - cursor, self.capacity - ring_offset, free)
+            overwritten = max(0, self.write_pos + nbytes - self.read_pos - self.capacity)
+            if overwritten:
+                print(f"AUDIO_OVERRUN|{self.name}|{overwritten}")
+            start = self.HEADER_SIZE + ring_offset
+            self.shm.buf[start:start + nbytes] = data[cursor:cursor + nbytes]
+            cursor += nbytes
+            self.write_pos += nbytes
+            self.seq += 1
+            # Publish the header only after the slice is in place.
+            self._write_header()
+            print(f"AUDIO_CHUNK|{self.name}|{start}|{nbytes}|{self.sample_rate}|{self.seq}")
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_audio_ring(runtime_cache, params):
+    ring = runtime_cache.get("audio_ring")
+    if ring is None:
+        capacity_mb = float(params.get("shm_capacity_mb") or 16)
+        ring = SharedAudioRing(
+            name=params.get("shm_name"),
+            capacity_bytes=int(capacity_mb * MB),
+            reader_timeout=float(params.get("shm_reader_timeout") or 2.0),
+        )
+        runtime_cache["audio_ring"] = ring
+        print(f"AUDIO_RING|{ring.name}|{ring.HEADER_SIZE}|{ring.capacity}")
+    return ring
+
+
+def close_audio_ring(runtime_cache):
+    ring = runtime_cache.pop("audio_ring", None)
+    if ring is not None:
+        ring.close()
+
+
+def synthesize_chunks(chunks, output_file, synthesize_chunk, params, profiler=None, audio_ring=None):
+    # Writes to output_file (when given) and/or publishes to audio_ring chunk by chunk.
+    profiler = profiler or NULL_PROFILER
+    pause_sentence = max(0.0, float(params.get("pause_sentence") or 0.0))
+    pause_paragraph = max(0.0, float(params.get("pause_paragraph") or 0.0))
+    writer = None
+    last_paragraph = None
+    chunk_count = 0
+
+    def emit(samples, sr):
+        if output_file is not None:
+            writer.write(samples)
+        if audio_ring is not None:
+            audio_ring.write(samples, sr)
+
+    try:
+        for paragraph_index, chunk, source_start, source_end in chunks:
+            chunk_count += 1
+            print(f"CHUNK|{chunk_count}|{source_start}|{source_end}|{preview_text_for_log(chunk, limit=80)}")
+            with profiler.span("tts.chunk", index=chunk_count, chars=len(chunk)):
+                audio, sr = synthesize_chunk(chunk)
+            with profiler.span("audio.write"):
+                if last_paragraph is None:
+                    if output_file is not None:
+                        writer = sf.SoundFile(output_file, mode="w", samplerate=sr, channels=1, subtype="PCM_16")
+                elif paragraph_index != last_paragraph:
+                    emit(np.zeros(int(sr * pause_paragraph), dtype=np.float32), sr)
+                else:
+                    emit(np.zeros(int(sr * pause_sentence), dtype=np.float32), sr)
+                emit(audio, sr)
+            last_paragraph = paragraph_index
+    finally:
+        if writer is not None:
+            writer.close()
+        if audio_ring is not None:
+            print(f"AUDIO_END|{audio_ring.name}|{audio_ring.seq}|{audio_ring.write_pos}")
+
+    if chunk_count == 0:
+        raise ValueError("No text to synthesize.")
+    return chunk_count
+
+
+MB = 1024 * 1024
+
+
+def sample_memory():
+    sample = {"rss_mb": None, "cuda_allocated_mb": None, "cuda_reserved_mb": None}
+    if psutil is not None:
+        sample["rss_mb"] = psutil.Process().memory_info().rss / MB
+    if torch.cuda.is_available() and torch.cuda.is_initialized():
+        sample["cuda_allocated_mb"] = torch.cuda.memory_allocated() / MB
+        sample["cuda_reserved_mb"] = torch.cuda.memory_reserved() / MB
+    return sample
+
+
+def _memory_delta(before, after):
+    delta = {}
+    for key, value in after.items():
+        if value is not None and before.get(key) is not None:
+            delta[key] = round(value - before[key], 1)
+    return delta
+
+
+def _cuda_peak_mb():
+    if torch.cuda.is_available() and torch.cuda.is_initialized():
+        return torch.cuda.max_memory_allocated() / MB
+    return None
+
+
+class MemoryTracker:
+    # Records RSS / CUDA memory before and after each stage of one request, aggregated by
+    # stage name so the report stays small however many chunks a job has.
+    # CUDA peaks are reset per stage; nested stages fold their peak into the parent.
+
+    def __init__(self):
+        self.stages = {}
+        self._stack = []
+        self._request_start = None
+        self._objects_start = 0
+
+    def start(self):
+        self._objects_start = len(gc.get_objects())
+        self._request_start = sample_memory()
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.reset_peak_memory_stats()
+
+    def enter(self, name: str):
+        if self._stack and torch.cuda.is_available() and torch.cuda.is_initialized():
+            parent = self._stack[-1]
+            parent["child_peak"] = max(parent["child_peak"], _cuda_peak_mb() or 0.0)
+        self._stack.append({"name": name, "before": sample_memory(), "child_peak": 0.0})
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.reset_peak_memory_stats()
+
+    def exit(self):
+        frame = self._stack.pop()
+        after = sample_memory()
+        stage = {"delta": _memory_delta(frame["before"], after)}
+        cuda_peak = _cuda_peak_mb()
+        if cuda_peak is not None:
+            cuda_peak = max(cuda_peak, frame["child_peak"])
+            stage["cuda_peak_mb"] = round(cuda_peak, 1)
+            if self._stack:
+                self._stack[-1]["child_peak"] = max(self._stack[-1]["child_peak"], cuda_peak)
+
+        total = self.stages.setdefault(frame["name"], {"count": 0, "delta": {}})
+        total["count"] += 1
+        for key, value in stage["delta"].items():
+            total["delta"][key] = round(total["delta"].get(key, 0.0) + value, 1)
+        if cuda_peak is not None:
+            total["cuda_peak_mb"] = max(total.get("cuda_peak_mb", 0.0), stage["cuda_peak_mb"])
+        return stage
+
+    def summary(self):
+        after = sample_memory()
+        return {
+            "before": self._request_start,
+            "after": after,
+            "delta": _memory_delta(self._request_start or {}, after),
+            "python_objects_delta": len(gc.get_objects()) - self._objects_start,
+            "stages": self.stages,
+        }
+
+
+DEFAULT_MAX_RSS_FRACTION = 0.75
+DEFAULT_MAX_CUDA_RESERVED_FRACTION = 0.9
+
+
+class MemoryGuard:
+    # Daemon watchdog: trims caches, then recycles loaded models when memory stays over the thresholds.
+    # Unset thresholds default to a fraction of system RAM / GPU memory; 0 disables a check.
+
+    def __init__(self, max_rss_mb=None, max_cuda_reserved_mb=None):
+        self.max_rss_mb = max_rss_mb
+        self.max_cuda_reserved_mb = max_cuda_reserved_mb
+
+    def limits(self):
+        max_rss_mb = self.max_rss_mb
+        if max_rss_mb is None and psutil is not None:
+            max_rss_mb = psutil.virtual_memory().total * DEFAULT_MAX_RSS_FRACTION / MB
+        max_cuda_reserved_mb = self.max_cuda_reserved_mb
+        if max_cuda_reserved_mb is None and torch.cuda.is_available() and torch.cuda.is_initialized():
+            total = torch.cuda.get_device_properties(torch.cuda.current_device()).total_memory
+            max_cuda_reserved_mb = total * DEFAULT_MAX_CUDA_RESERVED_FRACTION / MB
+        return max_rss_mb, max_cuda_reserved_mb
+
+    def over_threshold(self, sample):
+        max_rss_mb, max_cuda_reserved_mb = self.limits()
+        over = []
+        if max_rss_mb and sample["rss_mb"] is not None and sample["rss_mb"] > max_rss_mb:
+            over.append(f"rss {sample['rss_mb']:.0f}MB > {max_rss_mb:.0f}MB")
+        if (
+            max_cuda_reserved_mb
+            and sample["cuda_reserved_mb"] is not None
+            and sample["cuda_reserved_mb"] > max_cuda_reserved_mb
+        ):
+            over.append(f"cuda_reserved {sample['cuda_reserved_mb']:.0f}MB > {max_cuda_reserved_mb:.0f}MB")
+        return over
+
+    def check(self, runtime_cache):
+        over = self.over_threshold(sample_memory())
+        if not over:
+            return
+        print(f"MEMORY_GUARD|trim|{'; '.join(over)}")
+        trim_memory()
+
+        over = self.over_threshold(sample_memory())
+        if not over:
+            return
+        print(f"MEMORY_GUARD|recycle|{'; '.join(over)}")
+        release_runtime_models(runtime_cache)
+        trim_memory()
+        print(f"MEMORY_GUARD|after|{json.dumps(sample_memory())}")
+
+
+def trim_memory():
+    gc.collect()
+    if torch.cuda.is_available() and torch.cuda.is_initialized():
+        torch.cuda.empty_cache()
+        torch.cuda.ipc_collect()
+
+
+def release_runtime_models(runtime_cache):
+    # Models are reloaded lazily by ensure_runtime_models on the next request.
+    for key in ("vieneu", "chatterbox", "whisper"):
+        runtime_cache.pop(f"{key}_model", None)
+        runtime_cache.pop(f"{key}_device", None)
+        runtime_cache.pop(f"{key}_compiled", None)
+
+
+PROFILE_MODES = ("spans", "cprofile", "torch")
+
+
+def normalize_profile_mode(value):
+    if value in (None, False, "", "off", "none"):
+        return None
+    if value is True:
+        return "spans"
+    mode = str(value).strip().lower()
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unsupported profile mode '{value}'. Expected one of: {', '.join(PROFILE_MODES)}")
+    return mode
+
+
+class RequestProfiler:
+    # Collects named stage spans for one job and writes a Chrome/Perfetto trace plus a hotspot summary.
+    # With mode=None and no memory tracker every span is a no-op so unprofiled requests pay nothing.
+
+    def __init__(self, mode=None, trace_dir=None, job_name="job", top_n=30, memory=None):
+        self.mode = mode
+        self.memory = memory
+        self.trace_dir = trace_dir
+        self.job_name = job_name
+        self.top_n = top_n
+        self.events = []
+        self._origin = time.perf_counter()
+        self._cprofile = None
+        self._torch_profiler = None
+
+    @property
+    def enabled(self):
+        return self.mode is not None
+
+    @property
+    def recording(self):
+        return self.enabled or self.memory is not None
+
+    def start(self):
+        if self.memory is not None:
+            self.memory.start()
+        if self.mode == "cprofile":
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.mode == "torch":
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self._torch_profiler = torch.profiler.profile(activities=activities, record_shapes=False)
+            self._torch_profiler.__enter__()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        if not self.recording:
+            yield
+            return
+        record = torch.profiler.record_function(name) if self._torch_profiler is not None else None
+        if record is not None:
+            record.__enter__()
+        if self.memory is not None:
+            self.memory.enter(name)
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if self.memory is not None:
+                stage = self.memory.exit()
+                args = {**args, "memory_delta": stage["delta"]}
+            if record is not None:
+                record.__exit__(None, None, None)
+            if self.enabled:
+                self.events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": (begin - self._origin) * 1e6,
+                        "dur": (end - begin) * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": args,
+                    }
+                )
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._torch_profiler is not None:
+            self._torch_profiler.__exit__(None, None, None)
+
+    def span_summary(self):
+        totals = {}
+        for event in self.events:
+            count, dur = totals.get(event["name"], (0, 0.0))
+            totals[event["name"]] = (count + 1, dur + event["dur"])
+        lines = [f"{'stage':<40} {'calls':>6} {'total_ms':>12}"]
+        for name, (count, dur) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{name:<40} {count:>6} {dur / 1000.0:>12.2f}")
+        return "\n".join(lines)
+
+    def write_reports(self):
+        if not self.enabled:
+            return []
+        os.makedirs(self.trace_dir, exist_ok=True)
+        base = os.path.join(self.trace_dir, self.job_name)
+        written = []
+
+        trace_file = f"{base}.trace.json"
+        with open(trace_file, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        written.append(trace_file)
+
+        summary = [f"Job: {self.job_name}", "", self.span_summary()]
+        if self._cprofile is not None:
+            import io
+            import pstats
+
+            buf = io.StringIO()
+            pstats.Stats(self._cprofile, stream=buf).sort_stats("cumulative").print_stats(self.top_n)
+            summary += ["", "cProfile (cumulative):", buf.getvalue()]
+        if self._torch_profiler is not None:
+            torch_trace_file = f"{base}.torch.trace.json"
+            self._torch_profiler.export_chrome_trace(torch_trace_file)
+            written.append(torch_trace_file)
+            sort_key = "self_cuda_time_total" if torch.cuda.is_available() else "self_cpu_time_total"
+            table = self._torch_profiler.key_averages().table(sort_by=sort_key, row_limit=self.top_n)
+            summary += ["", "torch.profiler:", table]
+
+        summary_file = f"{base}.hotspots.txt"
+        with open(summary_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(summary))
+        written.append(summary_file)
+        return written
+
+
+_profile_job_counter = 0
+
+
+def create_request_profiler(params, paths, trace_dir=None):
+    global _profile_job_counter
+    mode = normalize_profile_mode(params.get("profile"))
+    # Per-stage memory tracking walks the Python heap, so it is opt-in per request.
+    memory = MemoryTracker() if params.get("track_memory") else None
+    if mode is None:
+        return RequestProfiler(memory=memory)
+    stem = os.path.splitext(os.path.basename(paths["output_file"]))[0]
+    _profile_job_counter += 1
+    job_name = f"{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}-{_profile_job_counter}_{stem}"
+    return RequestProfiler(
+        mode=mode,
+        trace_dir=trace_dir or os.path.join(paths["output_path"], "traces"),
+        job_name=job_name,
+        top_n=int(params.get("profile_top_n", 30)),
+        memory=memory,
+    )
+
+
+NULL_PROFILER = RequestProfiler()
+
+# Inner stages of each model that get their own span: (attribute path, method, span name).
+PROFILE_STAGES = {
+    "vieneu": (
+        ("backbone", "generate", "vieneu.backbone.generate"),
+        ("codec", "decode_code", "vieneu.codec.decode"),
+    ),
+    "chatterbox": (
+        ("t3", "inference", "chatterbox.t3.inference"),
+        ("s3gen", "inference", "chatterbox.s3gen.inference"),
+    ),
+}
+
+
+def _resolve_attr(obj, dotted: str):
+    for part in dotted.split("."):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def replace_method(obj, method: str, replacement):
+    # Installs replacement as an instance attribute and returns a callable that undoes it.
+    # The undo is skipped if the method was replaced again in the meantime, unless forced
+    # (restoring eager mode must also drop a profiling wrapper stacked on the compiled method).
+    own = vars(obj)
+    previous = own.get(method)
+    setattr(obj, method, replacement)
+
+    def undo(force=False):
+        if not force and own.get(method) is not replacement:
+            return
+        if previous is None:
+            own.pop(method, None)
+        else:
+            setattr(obj, method, previous)
+
+    return undo
+
+
+def _span_method(fn, profiler, name: str):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profiler.span(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def profile_model_stages(model, name: str, profiler):
+    # Wraps the model's sampling and decoding stages in spans for one request, so `spans`
+    # mode breaks a chunk down without needing torch.profiler.
+    undo = []
+    if profiler.recording:
+        for path, method, span_name in PROFILE_STAGES[name]:
+            target = _resolve_attr(model, path)
+            fn = getattr(target, method, None)
+            if fn is None or not hasattr(target, "__dict__"):
+                continue
+            undo.append(replace_method(target, method, _span_method(fn, profiler, span_name)))
+    try:
+        yield
+    finally:
+        for restore in reversed(undo):
+            restore()
+
+
+# (submodule, method) pairs compiled in compiled mode: the methods synthesis actually calls.
+# VieNeu samples through backbone.generate -> forward and decodes with codec.decode_code;
+# Chatterbox runs t3.tfmr through its HF backend and calls s3gen.flow/mel2wav.inference.
+# Targets missing from an installed model version are skipped.
+COMPILE_TARGETS = {
+    "vieneu": (("backbone", "forward"), ("codec", "decode_code")),
+    "chatterbox": (("t3.tfmr", "forward"), ("s3gen.flow", "inference"), ("s3gen.mel2wav", "inference")),
+}
+
+WARMUP_PROMPTS = {
+    "vi": (
+        "Xin chào.",
+        "Hôm nay trời đẹp, chúng ta cùng đi dạo nhé.",
+        "Cảm ơn bạn đã sử dụng ứng dụng, chúng tôi hy vọng giọng đọc này sẽ giúp công việc của bạn trở nên dễ dàng và thú vị hơn mỗi ngày.",
+    ),
+    "en": (
+        "Hello there.",
+        "The weather is lovely today, let us go for a walk.",
+        "Thank you for using this application, we hope this voice makes your daily work a little easier and a lot more enjoyable.",
+    ),
+}
+
+
+def _counted(fn, calls, label: str):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        calls[label] += 1
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def compile_tts_model(model, name: str, backend: str = "inductor"):
+    # Compiles the target methods in place (not via an OptimizedModule wrapper) so that HF
+    # generate() and the model's own inference helpers pick up the compiled graph. Each
+    # compiled method counts its calls, so the warm-up can confirm compiled code really ran.
+    compiled = {"undo": [], "calls": {}}
+    for path, method in COMPILE_TARGETS[name]:
+        module = _resolve_attr(model, path)
+        fn = getattr(module, method, None)
+        if not isinstance(module, torch.nn.Module) or fn is None:
+            continue
+        label = f"{path}.{method}"
+        compiled["calls"][label] = 0
+        compiled_fn = torch.compile(fn, backend=backend, dynamic=True)
+        compiled["undo"].append(replace_method(module, method, _counted(compiled_fn, compiled["calls"], label)))
+    print(f"Compiled {name} ({backend}): {', '.join(compiled['calls']) or 'no targets found'}")
+    return compiled
+
+
+def restore_eager_model(compiled):
+    for undo in reversed(compiled["undo"]):
+        undo(force=True)
+
+
+def apply_compile_mode(params, runtime_cache):
+    # The mode sticks across requests until a request sets `compile` explicitly.
+    if params.get("compile") is None:
+        return
+    compile_requested = bool(params.get("compile"))
+    backend = str(params.get("compile_backend") or "inductor")
+    for name in COMPILE_TARGETS:
+        model = runtime_cache.get(f"{name}_model")
+        if model is None:
+            continue
+        compiled = runtime_cache.get(f"{name}_compiled")
+        if compile_requested and compiled is None:
+            runtime_cache[f"{name}_compiled"] = compile_tts_model(model, name, backend)
+        elif not compile_requested and compiled is not None:
+            restore_eager_model(compiled)
+            runtime_cache[f"{name}_compiled"] = None
+            print(f"Restored eager mode for {name}.")
 
 
 def resolve_paths(params):
@@ -590,9 +1350,11 @@ def resolve_paths(params):
     }
 
 
-def ensure_runtime_models(params, paths, runtime_cache):
+def ensure_runtime_models(params, paths, runtime_cache, profiler=None):
+    profiler = profiler or NULL_PROFILER
     req_device = params.get("device", "auto")
-    cuda_ok, cuda_reason = detect_usable_cuda()
+    with profiler.span("detect_usable_cuda"):
+        cuda_ok, cuda_reason = detect_usable_cuda()
     if req_device == "cuda":
         if cuda_ok:
             device = "cuda"
@@ -626,8 +1388,10 @@ def ensure_runtime_models(params, paths, runtime_cache):
         ):
             runtime_cache["vieneu_model"] = None
             runtime_cache["vieneu_device"] = device
+            runtime_cache["vieneu_compiled"] = None
             print("Loading VieNeu-TTS model...")
-            runtime_cache["vieneu_model"] = load_vieneu_model(device)
+            with profiler.span("load_vieneu_model", device=device):
+                runtime_cache["vieneu_model"] = load_vieneu_model(device)
             print("VieNeu-TTS model loaded.")
     if should_load_chatterbox:
         if (
@@ -636,10 +1400,14 @@ def ensure_runtime_models(params, paths, runtime_cache):
         ):
             runtime_cache["chatterbox_model"] = None
             runtime_cache["chatterbox_device"] = device
+            runtime_cache["chatterbox_compiled"] = None
             print("Loading Chatterbox multilingual model...")
-            runtime_cache["chatterbox_model"] = load_chatterbox_model(device)
+            with profiler.span("load_chatterbox_model", device=device):
+                runtime_cache["chatterbox_model"] = load_chatterbox_model(device)
             print("Chatterbox multilingual model loaded.")
 
+    apply_compile_mode(params, runtime_cache)
+
     return {
         "device": device,
         "language": language,
@@ -649,70 +1417,216 @@ def ensure_runtime_models(params, paths, runtime_cache):
     }
 
 
-def process_request(params, runtime_cache):
-    paths = resolve_paths(params)
+def resolve_speaker_text(rt, params, paths, runtime_cache, profiler):
+    if not rt["use_vieneu"]:
+        return None
+    speaker_text = (params.get("speaker_text") or "").strip()
+    if speaker_text:
+        return speaker_text
+    # Cached per reference clip so a warm-up with the chosen speaker also saves the
+    # Whisper pass for the requests that follow.
+    speaker_wav = params["speaker_wav"]
+    cache_key = (os.path.abspath(speaker_wav), os.path.getmtime(speaker_wav))
+    speaker_texts = runtime_cache.setdefault("speaker_texts", {})
+    if cache_key not in speaker_texts:
+        print("Deriving speaker_text from speaker_wav for VieNeu-TTS...")
+        with profiler.span("transcribe_reference_audio"):
+            speaker_texts[cache_key] = transcribe_reference_audio(
+                runtime_cache=runtime_cache,
+                device=rt["device"],
+                whisper_path=paths["whisper_path"],
+                speaker_wav=speaker_wav,
+            )
+    return speaker_texts[cache_key]
 
-    try:
-        rt = ensure_runtime_models(params, paths, runtime_cache)
-        device = rt["device"]
-        language = rt["language"]
-        use_vieneu = rt["use_vieneu"]
-        chatterbox_model = rt["chatterbox_model"]
-        vieneu_model = rt["vieneu_model"]
-
-        if params.get("warmup_only"):
-            if params.get("export_srt", True):
-                print("Preloading Faster-Whisper model...")
-                whisper_model = runtime_cache.get("whisper_model")
-                whisper_device = runtime_cache.get("whisper_device")
-                if whisper_model is None or whisper_device != device:
-                    runtime_cache["whisper_model"] = create_whisper_model(device, paths["whisper_path"])
-                    runtime_cache["whisper_device"] = device
-            print("SUCCESS|WARMUP")
-            return "WARMUP"
 
-        text = params["text"]
-        print(f"TEXT_BEFORE_TTS|{preview_text_for_log(text)}")
-        print(f"Synthesizing voice directly to {paths['output_file']}...")
-        if use_vieneu:
-            speaker_text = (params.get("speaker_text") or "").strip()
-            if not speaker_text:
-                print("Deriving speaker_text from speaker_wav for VieNeu-TTS...")
-                speaker_text = transcribe_reference_audio(
-                    runtime_cache=runtime_cache,
-                    device=device,
-                    whisper_path=paths["whisper_path"],
-                    speaker_wav=params["speaker_wav"],
-                )
-            infer_vieneu_to_file(
+def call_with_eager_fallback(fn, rt, runtime_cache):
+    # torch.compile errors only surface on the first call of a compiled forward, which may be
+    # a real request; restore eager mode and retry once instead of failing the synthesis.
+    model_name = "vieneu" if rt["use_vieneu"] else "chatterbox"
+    try:
+        return fn()
+    except Exception as e:
+        compiled = runtime_cache.get(f"{model_name}_compiled")
+        if not compiled:
+            raise
+        print(f"WARNING: compiled {model_name} failed ({e}). Falling back to eager mode.")
+        restore_eager_model(compiled)
+        runtime_cache[f"{model_name}_compiled"] = None
+        return fn()
+
+
+def make_chunk_synthesizer(rt, params, speaker_text, runtime_cache):
+    vieneu_model = rt["vieneu_model"]
+    chatterbox_model = rt["chatterbox_model"]
+    if rt["use_vieneu"]:
+        def generate(chunk):
+            audio = generate_vieneu_audio(
                 vieneu_model,
-                text=text,
+                text=chunk,
                 speaker_wav=params["speaker_wav"],
                 speaker_text=speaker_text,
-                output_file=paths["output_file"],
                 temperature=params.get("temperature", 1.0),
             )
-        else:
-            infer_chatterbox_to_file(
+            return audio_to_mono_numpy(audio), vieneu_sample_rate(vieneu_model)
+    else:
+        def generate(chunk):
+            wav = generate_chatterbox_wav(
                 chatterbox_model,
-                text=text,
-                language=language,
-                speaker_wav=params["speaker_wav"],
-                output_file=paths["output_file"],
+                text=chunk,
+                language=rt["language"],
+                speaker_wav=params.get("speaker_wav"),
                 temperature=params.get("temperature", 0.8),
                 top_p=params.get("top_p", 1.0),
                 repetition_penalty=params.get("repetition_penalty", 2.0),
             )
+            return audio_to_mono_numpy(wav), chatterbox_model.sr
+
+    def synthesize_chunk(chunk):
+        return call_with_eager_fallback(lambda: generate(chunk), rt, runtime_cache)
+
+    return synthesize_chunk
+
+
+def _time_warmup_prompts(synthesize_chunk, prompts, mode, profiler):
+    results = []
+    for prompt in prompts:
+        timings = []
+        for _ in range(2):
+            begin = time.perf_counter()
+            with profiler.span("warmup.infer", chars=len(prompt), mode=mode):
+                synthesize_chunk(prompt)
+            timings.append((time.perf_counter() - begin) * 1000.0)
+        results.append({"chars": len(prompt), "first_ms": round(timings[0], 1), "steady_ms": round(timings[1], 1)})
+    return results
+
+
+def run_inference_warmup(rt, params, paths, runtime_cache, profiler):
+    # Runs dummy prompts of increasing length twice each: the first pass pays for lazy
+    # initialization (and graph capture in compiled mode), the second shows steady state.
+    # In compiled mode the prompts run eagerly first, then compiled, so both are reported.
+    model_name = "vieneu" if rt["use_vieneu"] else "chatterbox"
+    if rt["use_vieneu"] and not params.get("speaker_wav"):
+        print("Skipping inference warm-up: VieNeu-TTS needs speaker_wav.")
+        return None
+
+    model = rt[f"{model_name}_model"]
+    compile_mode = bool(runtime_cache.get(f"{model_name}_compiled"))
+    prompts = WARMUP_PROMPTS.get(rt["language"], WARMUP_PROMPTS["en"])
+    stats = {"model": model_name, "device": rt["device"], "modes": {}}
+    try:
+        speaker_text = resolve_speaker_text(rt, params, paths, runtime_cache, profiler)
+        synthesize_chunk = make_chunk_synthesizer(rt, params, speaker_text, runtime_cache)
+        if compile_mode:
+            restore_eager_model(runtime_cache[f"{model_name}_compiled"])
+            runtime_cache[f"{model_name}_compiled"] = None
+        print(f"Running eager inference warm-up for {model_name}...")
+        stats["modes"]["eager"] = _time_warmup_prompts(synthesize_chunk, prompts, "eager", profiler)
+        if compile_mode:
+            backend = str(params.get("compile_backend") or "inductor")
+            compiled = compile_tts_model(model, model_name, backend)
+            runtime_cache[f"{model_name}_compiled"] = compiled
+            print(f"Running compiled inference warm-up for {model_name}...")
+            timings = _time_warmup_prompts(synthesize_chunk, prompts, "compiled", profiler)
+            # A compile failure falls back to eager inside synthesize_chunk.
+            if runtime_cache.get(f"{model_name}_compiled") is compiled:
+                stats["compiled_calls"] = dict(compiled["calls"])
+                if any(compiled["calls"].values()):
+                    stats["modes"]["compiled"] = timings
+                else:
+                    print(f"WARNING: no compiled {model_name} target ran; compiled timings would measure eager code.")
+    except Exception as e:
+        print(f"WARNING: inference warm-up failed ({e}).")
+        return None
 
-        # Transcription (SRT)
-        if params.get("export_srt"):
-            print(f"Generating SRT using Faster-Whisper...")
+    print(f"WARMUP_STATS|{json.dumps(stats)}")
+    return stats
+
+
+def run_request(params, paths, runtime_cache, profiler):
+    # Validate options before paying for model loading.
+    segmenter = str(params.get("sentence_segmenter") or "underthesea").strip().lower()
+    if segmenter not in SENTENCE_SEGMENTERS:
+        raise ValueError(
+            f"Unsupported sentence_segmenter '{segmenter}'. Expected one of: {', '.join(SENTENCE_SEGMENTERS)}"
+        )
+    audio_transport = str(params.get("audio_transport") or "file").strip().lower()
+    if audio_transport not in AUDIO_TRANSPORTS:
+        raise ValueError(
+            f"Unsupported audio_transport '{audio_transport}'. Expected one of: {', '.join(AUDIO_TRANSPORTS)}"
+        )
+    if audio_transport == "shm" and not runtime_cache.get("daemon_mode"):
+        # One-shot runs exit right away and the segment would be unlinked before the host reads it.
+        raise ValueError("audio_transport 'shm' is only supported in --daemon mode.")
+
+    rt = ensure_runtime_models(params, paths, runtime_cache, profiler)
+    device = rt["device"]
+    language = rt["language"]
+
+    if params.get("warmup_only"):
+        # Opt-in: a full inference warm-up runs several synthesis passes.
+        if params.get("warmup_inference"):
+            run_inference_warmup(rt, params, paths, runtime_cache, profiler)
+        if params.get("export_srt", True):
+            print("Preloading Faster-Whisper model...")
             whisper_model = runtime_cache.get("whisper_model")
             whisper_device = runtime_cache.get("whisper_device")
             if whisper_model is None or whisper_device != device:
-                runtime_cache["whisper_model"] = create_whisper_model(device, paths["whisper_path"])
+                with profiler.span("load_whisper_model", device=device):
+                    runtime_cache["whisper_model"] = create_whisper_model(device, paths["whisper_path"])
                 runtime_cache["whisper_device"] = device
-            whisper_language = normalize_whisper_language(language)
+        return "WARMUP"
+
+    text_file = params.get("text_file")
+    if text_file:
+        print(f"TEXT_FILE_BEFORE_TTS|{text_file}")
+    else:
+        text = params["text"]
+        print(f"TEXT_BEFORE_TTS|{preview_text_for_log(text)}")
+    audio_ring = get_audio_ring(runtime_cache, params) if audio_transport == "shm" else None
+    # With the shared-memory transport, the WAV file is only written on final export.
+    output_file = paths["output_file"] if audio_ring is None or params.get("final_export") else None
+    if output_file:
+        print(f"Synthesizing voice directly to {output_file}...")
+    else:
+        print(f"Streaming voice to shared memory {audio_ring.name}...")
+    speaker_text = resolve_speaker_text(rt, params, paths, runtime_cache, profiler)
+
+    # Inline text and text files share one normalize/chunk pipeline, so a script sounds the
+    # same whether it was pasted or loaded from disk.
+    synthesize_chunk = make_chunk_synthesizer(rt, params, speaker_text, runtime_cache)
+    if text_file:
+        paragraphs = iter_text_file_paragraphs(text_file)
+    else:
+        paragraphs = iter_text_paragraphs(text)
+    model_name = "vieneu" if rt["use_vieneu"] else "chatterbox"
+    with profile_model_stages(rt[f"{model_name}_model"], model_name, profiler):
+        chunk_count = synthesize_chunks(
+            iter_tts_chunks(paragraphs, language, segmenter),
+            output_file=output_file,
+            synthesize_chunk=synthesize_chunk,
+            params=params,
+            profiler=profiler,
+            audio_ring=audio_ring,
+        )
+    print(f"Synthesized {chunk_count} chunks from {text_file or 'text'}")
+
+    if output_file is None:
+        if params.get("export_srt"):
+            print("Skipping SRT: no file was exported for shared-memory output.")
+        return f"shm://{audio_ring.name}"
+
+    # Transcription (SRT)
+    if params.get("export_srt"):
+        print(f"Generating SRT using Faster-Whisper...")
+        whisper_model = runtime_cache.get("whisper_model")
+        whisper_device = runtime_cache.get("whisper_device")
+        if whisper_model is None or whisper_device != device:
+            with profiler.span("load_whisper_model", device=device):
+                runtime_cache["whisper_model"] = create_whisper_model(device, paths["whisper_path"])
+            runtime_cache["whisper_device"] = device
+        whisper_language = normalize_whisper_language(language)
+        with profiler.span("whisper.srt"):
             segments, info = runtime_cache["whisper_model"].transcribe(
                 paths["output_file"],
                 beam_size=5,
@@ -720,22 +1634,62 @@ def process_request(params, runtime_cache):
                 task="transcribe",
             )
             srt_content = generate_srt(segments)
-            
-            srt_file = paths["output_file"].replace(".wav", ".srt")
-            with open(srt_file, "w", encoding="utf-8") as f:
-                f.write(srt_content)
-            print(f"SRT saved to {srt_file}")
-
-        print(f"SUCCESS|{paths['output_file']}")
-        return paths["output_file"]
         
+        srt_file = paths["output_file"].replace(".wav", ".srt")
+        with open(srt_file, "w", encoding="utf-8") as f:
+            f.write(srt_content)
+        print(f"SRT saved to {srt_file}")
+
+    return paths["output_file"]
+
+
+def process_request(params, runtime_cache, trace_dir=None, memory_guard=None):
+    paths = resolve_paths(params)
+    profiler = create_request_profiler(params, paths, trace_dir)
+    # The guard only needs a before/after sample; stages are tracked when track_memory is set.
+    memory_before = sample_memory() if memory_guard is not None else None
+
+    try:
+        profiler.start()
+        try:
+            with profiler.span("process_request"):
+                result = run_request(params, paths, runtime_cache, profiler)
+        finally:
+            profiler.stop()
+            try:
+                for report_file in profiler.write_reports():
+                    print(f"PROFILE|{report_file}")
+            except Exception as e:
+                # Never let a report failure mask the synthesis result or error.
+                print(f"WARNING: failed to write profile reports ({e}).")
+            if profiler.memory is not None:
+                print(f"MEMORY|{json.dumps(profiler.memory.summary())}")
+            elif memory_before is not None:
+                memory_after = sample_memory()
+                memory_report = {
+                    "before": memory_before,
+                    "after": memory_after,
+                    "delta": _memory_delta(memory_before, memory_after),
+                }
+                print(f"MEMORY|{json.dumps(memory_report)}")
+            if memory_guard is not None:
+                try:
+                    memory_guard.check(runtime_cache)
+                except Exception as e:
+                    # Same as reports: a guard failure must not mask the synthesis result or error.
+                    print(f"WARNING: memory guard check failed ({e}).")
+
+        print(f"SUCCESS|{result}")
+        return result
+
     except Exception as e:
         print(f"ERROR: {str(e)}", file=sys.stderr)
         raise
 
 
-def run_daemon():
-    runtime_cache = {}
+def run_daemon(trace_dir=None, memory_guard=None):
+    runtime_cache = {"daemon_mode": True}
+    memory_guard = memory_guard or MemoryGuard()
     print("READY|DAEMON")
     for raw in sys.stdin:
         line = raw.strip()
@@ -748,20 +1702,28 @@ def run_daemon():
                 print("SUCCESS|SHUTDOWN")
                 break
             params = msg.get("params", msg)
-            process_request(params, runtime_cache)
+            process_request(params, runtime_cache, trace_dir=trace_dir, memory_guard=memory_guard)
         except Exception as e:
             print(f"ERROR|{str(e)}")
             continue
+    close_audio_ring(runtime_cache)
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--params", type=str, required=False)
     parser.add_argument("--daemon", action="store_true")
+    parser.add_argument("--trace-dir", type=str, required=False)
+    parser.add_argument("--max-rss-mb", type=float, required=False)
+    parser.add_argument("--max-cuda-reserved-mb", type=float, required=False)
     args = parser.parse_args()
 
     if args.daemon:
-        run_daemon()
+        memory_guard = MemoryGuard(
+            max_rss_mb=args.max_rss_mb,
+            max_cuda_reserved_mb=args.max_cuda_reserved_mb,
+        )
+        run_daemon(trace_dir=args.trace_dir, memory_guard=memory_guard)
         return
 
     if not args.params:
@@ -769,7 +1731,7 @@ def main():
         sys.exit(1)
 
     params = json.loads(args.params)
-    process_request(params, runtime_cache={})
+    process_request(params, runtime_cache={}, trace_dir=args.trace_dir)
 
 if __name__ == "__main__":
     main()
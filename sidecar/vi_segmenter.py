@@ -0,0 +1,140 @@
+import re
+
+# Single-pass, rule-based Vietnamese sentence segmenter for TTS chunking.
+# Kept free of heavy imports so it can be used (and benchmarked) without the model stack.
+# It exists mainly to avoid importing underthesea (about 0.5 s and its model files): on the
+# sample corpus it is only ~1.3x faster per call and agrees less (boundary F1 ~0.89), so
+# underthesea stays the default and this is opt-in via sentence_segmenter="rule".
+
+VI_ABBREVIATIONS = {
+    "tp",
+    "tt",
+    "tx",
+    "q",
+    "p",
+    "ts",
+    "ths",
+    "th.s",
+    "pgs",
+    "pgs.ts",
+    "gs",
+    "gs.ts",
+    "bs",
+    "ks",
+    "cn",
+    "ls",
+    "nxb",
+    "vd",
+    "tr",
+    "st",
+    "mr",
+    "mrs",
+    "ms",
+    "dr",
+    "sđt",
+    "đt",
+}
+
+_OPENERS = "\"'([{«“‘"
+_CLOSERS = "\"')]}»”’"
+
+# A word ending in sentence punctuation (plus closing quotes/brackets), and the first
+# character of the following word after any opening quotes/brackets.
+_TERMINAL_RE = re.compile(
+    r"(?<!\S)(\S*?)([.!?…])[" + re.escape(_CLOSERS) + r"]*(?=\s+[" + re.escape(_OPENERS) + r"]*(\S)|\s*$)"
+)
+_SOFT_BREAK_RE = re.compile(r"[,;:][" + re.escape(_CLOSERS) + r"]*(?=\s)")
+
+
+def _is_name_initial(stem: str, preceding: str) -> bool:
+    # A capital letter after a capitalized name token that is not itself sentence-initial,
+    # e.g. "Ông Nguyễn V. An". "điểm A. Còn" and "Vitamin C. Bạn" still end the sentence.
+    if len(stem) != 1 or not stem.isupper():
+        return False
+    words = preceding.rsplit(None, 2)
+    if len(words) < 2:
+        return False
+    prev = words[-1].lstrip(_OPENERS)
+    return prev[:1].isupper() and prev[-1:].isalpha()
+
+
+def _is_abbreviation(word: str, at_segment_start: bool, preceding: str) -> bool:
+    stem = word.lstrip(_OPENERS).rstrip(".")
+    if stem.lower() in VI_ABBREVIATIONS:
+        return True
+    if _is_name_initial(stem, preceding):
+        return True
+    # List numbering at the start of a segment, e.g. "1. Giới thiệu".
+    return at_segment_start and stem.isdigit()
+
+
+def _split_long_span(text: str, start: int, end: int, max_words: int, spans):
+    # Greedily pack "," / ";" / ":" separated pieces up to max_words; a single piece
+    # longer than the limit is kept whole.
+    piece_start = start
+    buf_start = start
+    buf_end = None
+    buf_words = 0
+    for match in _SOFT_BREAK_RE.finditer(text, start, end):
+        piece_end = match.end()
+        piece_words = len(text[piece_start:piece_end].split())
+        if buf_end is not None and buf_words + piece_words > max_words:
+            spans.append((buf_start, buf_end))
+            buf_start = piece_start
+            buf_words = 0
+        buf_end = piece_end
+        buf_words += piece_words
+        piece_start = piece_end
+        while piece_start < end and text[piece_start].isspace():
+            piece_start += 1
+    tail_words = len(text[piece_start:end].split())
+    if buf_end is not None and buf_words + tail_words > max_words:
+        spans.append((buf_start, buf_end))
+        buf_start = piece_start
+    spans.append((buf_start, end))
+
+
+def segment_vietnamese(text: str, max_words: int = 24):
+    # Returns (start, end) offsets into `text`, one per TTS-ready chunk.
+    # Only words ending in . ! ? … are inspected, so the scan runs at regex speed.
+    spans = []
+    start = 0
+    length = len(text)
+    while start < length and text[start].isspace():
+        start += 1
+
+    def close(end):
+        if end <= start:
+            return
+        # Word count is at most separators + 1, so short sentences skip split().
+        separators = text.count(" ", start, end) + text.count("\n", start, end) + text.count("\t", start, end)
+        if separators >= max_words and len(text[start:end].split()) > max_words:
+            _split_long_span(text, start, end, max_words, spans)
+        else:
+            spans.append((start, end))
+
+    for match in _TERMINAL_RE.finditer(text):
+        if match.start() < start:
+            continue
+        punct = match.group(2)
+        if punct in ".…":
+            next_char = match.group(3)
+            if next_char and not (next_char.isupper() or next_char.isdigit()):
+                continue
+            if punct == "." and next_char:
+                at_start = match.start() == start
+                preceding = "" if at_start else text[max(start, match.start() - 64):match.start()]
+                if _is_abbreviation(match.group(1), at_start, preceding):
+                    continue
+        close(match.end())
+        start = match.end()
+        while start < length and text[start].isspace():
+            start += 1
+
+    end = len(text.rstrip())
+    close(end)
+    return spans
+
+
+def split_vietnamese_sentences(text: str, max_words: int = 24):
+    return [text[start:end] for start, end in segment_vietnamese(text, max_words)]
@@ -33,7 +33,8 @@ hidden_imports += [
     's3tokenizer',
     'conformer',
     'diffusers',
-    'perth'
+    'perth',
+    'psutil'
 ]
 # Keep onefile EXE lean: heavy runtime DLLs are shipped externally via copy_dlls.bat
 excluded_packages = ['torch', 'ctranslate2']
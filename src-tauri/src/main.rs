@@ -19,7 +19,9 @@ struct AppState {
 
 #[derive(Serialize, Deserialize)]
 struct SynthesisParams {
+    #[serde(default)]
     text: String,
+    text_file: Option<String>,
     speaker_wav: String,
     language: String,
     speed: f32,
@@ -33,6 +35,9 @@ struct SynthesisParams {
     device: Option<String>,
     pause_sentence: Option<f32>,
     pause_paragraph: Option<f32>,
+    audio_transport: Option<String>,
+    compile: Option<bool>,
+    sentence_segmenter: Option<String>,
 }
 
 #[tauri::command]
@@ -165,6 +170,12 @@ fn run_synthesis(
     window: tauri::Window,
     state: tauri::State<'_, AppState>,
 ) -> Result<String, String> {
+    // The shared-memory transport has no reader here yet; the UI can only play files.
+    if let Some(transport) = params.audio_transport.as_deref() {
+        if transport != "file" {
+            return Err(format!("Unsupported audio_transport '{}': only file output is supported", transport));
+        }
+    }
     let request = serde_json::json!({
         "action": "synthesize",
         "params": params
@@ -178,9 +189,14 @@ fn run_synthesis(
     }
 }
 
-#[tauri::command]
+// Async so a long warm-up runs off the main thread instead of freezing the window.
+#[tauri::command(async)]
 fn warmup_models(
     device: Option<String>,
+    language: Option<String>,
+    speaker_wav: Option<String>,
+    compile: Option<bool>,
+    warmup_inference: Option<bool>,
     window: tauri::Window,
     state: tauri::State<'_, AppState>,
 ) -> Result<(), String> {
@@ -190,6 +206,10 @@ fn warmup_models(
             "warmup_only": true,
             "preload_all_tts": false,
             "device": device.unwrap_or_else(|| "auto".to_string()),
+            "language": language.unwrap_or_else(|| "vi".to_string()),
+            "speaker_wav": speaker_wav,
+            "compile": compile,
+            "warmup_inference": warmup_inference.unwrap_or(false),
             "export_srt": false
         }
     })
@@ -38,6 +38,8 @@ const SUPPORTED_LANGUAGES = [
 function App() {
     // State
     const [text, setText] = useState('');
+    // Path of the loaded .txt file while the text is unedited; the sidecar then streams it from disk.
+    const [textFile, setTextFile] = useState<string | null>(null);
     const [speakerWav, setSpeakerWav] = useState('');
     const [language, setLanguage] = useState('vi');
     const [speed, setSpeed] = useState(1.0);
@@ -45,6 +47,7 @@ function App() {
     const [pauseSentence, setPauseSentence] = useState(0.3);
     const [pauseParagraph, setPauseParagraph] = useState(0.8);
     const [exportSrt, setExportSrt] = useState(true);
+    const [warmingUp, setWarmingUp] = useState(false);
 
     const [outputPath, setOutputPath] = useState('C:/Users/namng/OneDrive/Desktop/output');
     const [outputFilename, setOutputFilename] = useState('output_voice');
@@ -181,7 +184,11 @@ function App() {
             setProgress(5);
             appendLog('[Hệ thống] Đang khởi tạo mô hình AI...');
             try {
-                await invoke('warmup_models', { device: deviceMode.includes('gpu') ? 'cuda' : 'cpu' });
+                await invoke('warmup_models', {
+                    device: deviceMode.includes('gpu') ? 'cuda' : 'cpu',
+                    language,
+                    speakerWav: speakerWav || null
+                });
                 appendLog('[Hệ thống] Khởi tạo AI thành công, sẵn sàng tạo voice.');
             } catch (e) {
                 appendLog(`[LỖI] Khởi tạo AI thất bại: ${String(e)}`, 'error');
@@ -222,7 +229,8 @@ function App() {
         try {
             const result = await invoke<string>('run_synthesis', {
                 params: {
-                    text,
+                    text: textFile ? '' : text,
+                    text_file: textFile,
                     speaker_wav: speakerWav,
                     language,
                     speed,
@@ -274,6 +282,25 @@ function App() {
         if (selected && typeof selected === 'string') setSpeakerWav(selected);
     };
 
+    // Runs a few real synthesis passes with the chosen voice; it keeps the sidecar busy, so only on request.
+    const handleWarmupInference = async () => {
+        setWarmingUp(true);
+        appendLog('[Hệ thống] Đang chạy thử mô hình với giọng mẫu...');
+        try {
+            await invoke('warmup_models', {
+                device: deviceMode.includes('gpu') ? 'cuda' : 'cpu',
+                language,
+                speakerWav,
+                warmupInference: true
+            });
+            appendLog('[Hệ thống] Đã khởi động sẵn mô hình với giọng mẫu.');
+        } catch (e) {
+            appendLog(`[CANH BAO] Chạy thử với giọng mẫu thất bại: ${String(e)}`);
+        } finally {
+            setWarmingUp(false);
+        }
+    };
+
     const handlePickTextFile = async () => {
         const selected = await open({
             multiple: false,
@@ -283,6 +310,7 @@ function App() {
             try {
                 const content = await invoke<string>('read_text_file', { path: selected });
                 setText(content);
+                setTextFile(selected);
                 appendLog(`[Hệ thống] Đã tải nội dung từ: ${selected.split('\\').pop()}`);
             } catch (e) {
                 alert('Không thể đọc file: ' + e);
@@ -334,15 +362,15 @@ function App() {
                             </span>
                             <div className="flex gap-3">
                                 <button onClick={handlePickTextFile} className="text-[10px] font-bold text-emerald-600 hover:text-emerald-700 flex items-center gap-1"><Upload size={10} /> Tải file .txt</button>
-                                <button onClick={async () => setText(await navigator.clipboard.readText())} className="text-[10px] font-bold text-blue-500 hover:text-blue-600">Dán từ Clipboard</button>
-                                <button onClick={() => setText('')} className="text-[10px] font-bold text-red-500 hover:text-red-600">Xóa sạch</button>
+                                <button onClick={async () => { setText(await navigator.clipboard.readText()); setTextFile(null); }} className="text-[10px] font-bold text-blue-500 hover:text-blue-600">Dán từ Clipboard</button>
+                                <button onClick={() => { setText(''); setTextFile(null); }} className="text-[10px] font-bold text-red-500 hover:text-red-600">Xóa sạch</button>
                             </div>
                         </div>
                         <textarea
                             className="flex-1 p-3 text-base leading-relaxed outline-none resize-none placeholder:text-slate-200 text-slate-600"
                             placeholder="Nhập nội dung cần chuyển sang giọng nói..."
                             value={text}
-                            onChange={(e) => setText(e.target.value)}
+                            onChange={(e) => { setText(e.target.value); setTextFile(null); }}
                         />
                     </div>
 
@@ -357,6 +385,7 @@ function App() {
                                 value={speakerWav ? speakerWav.split('\\').slice(-1)[0] : 'Nhấp để chọn file ghi âm mẫu...'}
                             />
                             <button onClick={handlePickSpeakerWav} className="px-4 py-1.5 bg-white border border-slate-200 rounded text-[10px] font-bold text-slate-500 hover:bg-slate-50">Chọn file</button>
+                            {speakerWav && <button onClick={handleWarmupInference} disabled={warmingUp || loading || initializing} className="px-3 py-1.5 bg-white border border-slate-200 rounded text-[10px] font-bold text-slate-500 hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed">{warmingUp ? 'Đang chạy thử...' : 'Chạy thử'}</button>}
                             {speakerWav && <button onClick={() => setSpeakerWav('')} className="p-1 px-2 border border-slate-200 rounded text-red-400 hover:bg-red-50"><X size={14} /></button>}
                         </div>
                     </div>
@@ -408,7 +437,7 @@ function App() {
                                 ) : (
                                     <button
                                         onClick={handleSynthesize}
-                                        disabled={initializing}
+                                        disabled={initializing || warmingUp}
                                         className="flex-1 py-2 bg-white border border-blue-500 text-blue-500 rounded font-black text-[11px] hover:bg-blue-500 hover:text-white transition-all flex items-center justify-center gap-2 shadow-sm disabled:opacity-50 disabled:cursor-not-allowed disabled:hover:bg-white disabled:hover:text-blue-500"
                                     >
                                         {initializing ? 'Đang khởi tạo AI...' : 'Bắt đầu tạo Voice'}